@@ -0,0 +1,37 @@
+"""
+Ahead-of-time build of the EnviroScan raster kernels.
+
+Compiles the NDVI, statistics and change detection kernels into the enviroscan_kernels
+extension module in the backend directory, so no JIT compilation is needed
+at run time. ndvi.py and change_detection.py fall back to their Numba JIT
+kernels when the extension has not been built.
+
+Trade-off: numba.pycc compiles prange as a plain range, so the AOT kernels
+are single-threaded, and the per-worker numba.set_num_threads cap in
+run_in_process_pool does not apply to them. Only process-level parallelism
+across years and periods remains. Build them when cold-start time matters
+more than per-task throughput, e.g. short runs on many fresh workers.
+
+Usage:
+    python backend/_kernels_build.py
+"""
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from numba.pycc import CC
+from ndvi import _ndvi_kernel_jit, _tile_stats_jit
+from change_detection import _split_changes_jit
+
+cc = CC('enviroscan_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Kernels take flat, C-contiguous float32 arrays and write their outputs in place
+cc.export('ndvi_f32', 'void(f4[::1], f4[::1], f4[::1])')(_ndvi_kernel_jit.py_func)
+cc.export('tile_stats_f32', 'Tuple((f8, f8, f8, f8, i8))(f4[::1])')(_tile_stats_jit.py_func)
+cc.export('split_changes_f32', 'void(f4[::1], f4[::1], f4[::1], f4[::1])')(_split_changes_jit.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""
+Tile pyramid builder for EnviroScan system.
+Pre-renders the land cover classification maps as Web Mercator PNG map tiles.
+
+The tiles are written to the dashboard's static directory so the dashboard can
+show them as a map overlay without rendering anything at request time.
+
+Usage:
+    python backend/build_tiles.py
+"""
+import logging
+import math
+import warnings
+import numpy as np
+from utils import (
+    CLASSIFICATION_MAPS_DIR, PROJECT_ROOT, ensure_output_dirs, get_analysis_years, get_study_area_bounds,
+    setup_logging
+)
+
+# Output directory served by Streamlit as /app/static/tiles
+TILES_DIR = PROJECT_ROOT / 'dashboard' / 'static' / 'tiles'
+
+# Zoom levels of the tile pyramid and the tile size in pixels
+TILE_ZOOM_LEVELS = range(8, 15)
+TILE_SIZE = 256
+
+# Half the width of the Web Mercator world in metres
+WEB_MERCATOR_EXTENT = 20037508.342789244
+
+# RGBA color of each land cover class (Forest, Water, Urban, Agriculture);
+# every other value, including nodata, is transparent
+LAND_COVER_LUT = np.zeros((256, 4), dtype=np.uint8)
+LAND_COVER_LUT[:4] = [
+    [0, 128, 0, 255],
+    [0, 0, 255, 255],
+    [128, 128, 128, 255],
+    [255, 255, 0, 255]
+]
+
+# Class value used for pixels outside the classified raster
+NODATA = 255
+
+def build_tiles():
+    """
+    Build the land cover tile pyramid for every analysis year.
+    
+    Each classification GeoTIFF is reprojected tile by tile to Web Mercator,
+    colored with the land cover lookup table and saved as
+    tiles/classification_{year}/{z}/{x}/{y}.png.
+    """
+    logging.info("Building land cover tile pyramids")
+    
+    try:
+        for year in get_analysis_years():
+            tiff_path = CLASSIFICATION_MAPS_DIR / f"classification_{year}.tif"
+            count = build_raster_tiles(tiff_path, TILES_DIR / f"classification_{year}")
+            logging.info(f"Wrote {count} tiles for {year}")
+        
+        logging.info("Tile pyramids completed")
+    
+    except Exception as e:
+        logging.error(f"Error building tile pyramids: {str(e)}")
+        raise
+
+def build_raster_tiles(tiff_path, output_dir, zoom_levels=TILE_ZOOM_LEVELS):
+    """
+    Render one classified raster into a directory of XYZ PNG tiles.
+    
+    Args:
+        tiff_path (Path): Classification GeoTIFF to tile
+        output_dir (Path): Root directory of the tile pyramid
+        zoom_levels (iterable): Zoom levels to render
+    
+    Returns:
+        int: Number of tiles written
+    """
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.errors import NotGeoreferencedWarning
+    from rasterio.transform import from_origin
+    from rasterio.warp import reproject
+    
+    min_lon, min_lat, max_lon, max_lat = get_study_area_bounds()
+    classes = np.empty((TILE_SIZE, TILE_SIZE), dtype=np.uint8)
+    count = 0
+    
+    with rasterio.open(tiff_path) as src, warnings.catch_warnings():
+        # PNG tiles carry no georeferencing; their position is in the path
+        warnings.simplefilter('ignore', NotGeoreferencedWarning)
+        
+        for zoom in zoom_levels:
+            min_x, min_y = lonlat_to_tile(min_lon, max_lat, zoom)
+            max_x, max_y = lonlat_to_tile(max_lon, min_lat, zoom)
+            span = 2 * WEB_MERCATOR_EXTENT / 2 ** zoom
+            
+            for x in range(min_x, max_x + 1):
+                tile_dir = output_dir / str(zoom) / str(x)
+                tile_dir.mkdir(parents=True, exist_ok=True)
+                
+                for y in range(min_y, max_y + 1):
+                    transform = from_origin(
+                        -WEB_MERCATOR_EXTENT + x * span,
+                        WEB_MERCATOR_EXTENT - y * span,
+                        span / TILE_SIZE,
+                        span / TILE_SIZE
+                    )
+                    classes.fill(NODATA)
+                    reproject(
+                        source=rasterio.band(src, 1),
+                        destination=classes,
+                        dst_transform=transform,
+                        dst_crs='EPSG:3857',
+                        dst_nodata=NODATA,
+                        resampling=Resampling.nearest
+                    )
+                    
+                    # Band-major RGBA tile gathered from the lookup table
+                    rgba = LAND_COVER_LUT[classes].transpose(2, 0, 1)
+                    with rasterio.open(
+                        tile_dir / f"{y}.png", 'w',
+                        driver='PNG',
+                        width=TILE_SIZE,
+                        height=TILE_SIZE,
+                        count=4,
+                        dtype='uint8'
+                    ) as dst:
+                        dst.write(rgba)
+                    count += 1
+    
+    return count
+
+def lonlat_to_tile(lon, lat, zoom):
+    """
+    Get the XYZ tile containing a point.
+    
+    Args:
+        lon (float): Longitude in degrees
+        lat (float): Latitude in degrees
+        zoom (int): Zoom level
+    
+    Returns:
+        tuple: (x, y) tile indices
+    """
+    n = 2 ** zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return x, y
+
+if __name__ == "__main__":
+    ensure_output_dirs()
+    setup_logging()
+    build_tiles()
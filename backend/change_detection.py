@@ -2,10 +2,82 @@
 Change detection module for EnviroScan system.
 Detects environmental changes over time by comparing NDVI values.
 """
-import os
 import logging
+from functools import lru_cache
 import numpy as np
-from utils import get_analysis_years
+from numba import njit, prange
+from utils import (
+    CHANGE_MAPS_DIR, ensure_output_dirs, fill_uniform, get_raster_shape, get_rng,
+    iter_row_strips, open_scratch_raster, run_in_process_pool, save_geotiff
+)
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _split_changes_jit(diff, loss, gain, heat):
+    """
+    Split a flat NDVI difference array into loss, gain and change magnitude in one pass.
+
+    Args:
+        diff (np.ndarray): Flat NDVI difference (year2 - year1)
+        loss (np.ndarray): Flat output for vegetation loss, written in place
+        gain (np.ndarray): Flat output for vegetation gain, written in place
+        heat (np.ndarray): Flat output for absolute change, written in place
+    """
+    for i in prange(diff.size):
+        d = diff[i]
+        if d < 0:
+            loss[i] = -d
+            gain[i] = 0.0
+            heat[i] = -d
+        else:
+            loss[i] = 0.0
+            gain[i] = d
+            heat[i] = d
+
+try:
+    # Ahead-of-time compiled kernel, built by _kernels_build.py
+    from enviroscan_kernels import split_changes_f32 as _split_changes
+except ImportError:
+    _split_changes = _split_changes_jit
+
+@lru_cache(maxsize=None)
+def _get_buffers(shape, dtype=np.float32):
+    """
+    Get zero-initialised (ndvi1, ndvi2, diff, loss, gain, heat) buffers, allocated once per shape.
+
+    Args:
+        shape (tuple): Raster shape
+        dtype (type): Buffer dtype
+
+    Returns:
+        tuple: (ndvi1, ndvi2, diff, loss, gain, heat) arrays
+    """
+    return tuple(np.zeros(shape, dtype=dtype) for _ in range(6))
+
+def compute_changes(ndvi1, ndvi2, buffers):
+    """
+    Compute vegetation loss, gain and change heatmap between two NDVI rasters.
+
+    Both years are processed in the same strip of rows, so the difference
+    and the split into loss/gain/heatmap run while the strip is in cache.
+
+    Args:
+        ndvi1 (np.ndarray): NDVI for the first year
+        ndvi2 (np.ndarray): NDVI for the second year
+        buffers (tuple): (diff, loss, gain, heat) float32 output arrays
+
+    Returns:
+        tuple: (diff, loss, gain, heat) arrays
+    """
+    diff, loss, gain, heat = buffers
+    for rows in iter_row_strips(diff.shape[0]):
+        np.subtract(ndvi2[rows], ndvi1[rows], out=diff[rows])
+        _split_changes(
+            diff[rows].reshape(-1),
+            loss[rows].reshape(-1),
+            gain[rows].reshape(-1),
+            heat[rows].reshape(-1)
+        )
+    return diff, loss, gain, heat
 
 def detect_changes():
     """
@@ -31,27 +103,8 @@ def detect_changes():
     ]
     
     try:
-        # Create output directory
-        change_maps_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-            'output', 'change_maps'
-        )
-        os.makedirs(change_maps_dir, exist_ok=True)
-        
-        for period in comparisons:
-            year1, year2 = period
-            logging.info(f"Detecting changes between {year1} and {year2}")
-            
-            # In practice, this would:
-            # 1. Load NDVI maps for both years
-            # 2. Calculate difference (year2 - year1)
-            # 3. Identify significant changes
-            # 4. Generate vegetation loss/gain maps
-            # 5. Create change heatmaps
-            # 6. Save outputs as GeoTIFF and PNG
-            
-            # Simulate change detection
-            simulate_change_detection(year1, year2, change_maps_dir)
+        # Comparison periods are independent, so process them in parallel
+        run_in_process_pool(_process_period, comparisons, CHANGE_MAPS_DIR, initializer=_init_worker)
             
         logging.info("Change detection completed")
         
@@ -59,6 +112,52 @@ def detect_changes():
         logging.error(f"Error in change detection: {str(e)}")
         raise
 
+def _init_worker():
+    """Load the compiled change detection kernel once per worker process."""
+    buffer = np.zeros(1, dtype=np.float32)
+    _split_changes(buffer, buffer, buffer, buffer)
+
+def _process_period(period, output_dir):
+    """
+    Detect changes for a single comparison period in a worker process.
+    
+    Args:
+        period (tuple): (year1, year2) to compare
+        output_dir (Path): Directory to save outputs
+    """
+    year1, year2 = period
+    logging.info(f"Detecting changes between {year1} and {year2}")
+    
+    # In practice, this would:
+    # 1. Load NDVI maps for both years
+    # 2. Calculate difference (year2 - year1)
+    # 3. Identify significant changes
+    # 4. Generate vegetation loss/gain maps
+    # 5. Create change heatmaps
+    # 6. Save outputs as GeoTIFF and PNG
+    
+    # Simulate change detection
+    simulate_change_detection(year1, year2, output_dir)
+
+def _load_ndvi(year, buffer):
+    """
+    Open the memory-mapped NDVI raster of a year, or simulate one if it is missing.
+    
+    Args:
+        year (int): Year to load
+        buffer (np.ndarray): Buffer filled with simulated NDVI if needed
+    
+    Returns:
+        np.ndarray: NDVI raster
+    """
+    try:
+        return open_scratch_raster(f"ndvi_{year}.dat")
+    except FileNotFoundError:
+        logging.warning(f"No NDVI raster found for {year}, using simulated NDVI")
+    
+    # Simulated NDVI in [-1, 1]
+    return fill_uniform(get_rng(year), buffer, -1.0, 1.0)
+
 def simulate_change_detection(year1, year2, output_dir):
     """
     Simulate change detection between two years.
@@ -66,47 +165,45 @@ def simulate_change_detection(year1, year2, output_dir):
     Args:
         year1 (int): First year
         year2 (int): Second year
-        output_dir (str): Directory to save outputs
+        output_dir (Path): Directory to save outputs
     """
-    # Create simulated change arrays
-    # Difference in NDVI values (year2 - year1)
-    diff_array = np.random.uniform(-1, 1, (100, 100))
+    ndvi1_buffer, ndvi2_buffer, *buffers = _get_buffers(get_raster_shape())
     
-    # Vegetation loss map (negative changes)
-    loss_array = np.where(diff_array < 0, np.abs(diff_array), 0)
+    # Load NDVI for both years, streamed from the memory maps strip by strip
+    ndvi1 = _load_ndvi(year1, ndvi1_buffer)
+    ndvi2 = _load_ndvi(year2, ndvi2_buffer)
     
-    # Vegetation gain map (positive changes)
-    gain_array = np.where(diff_array > 0, diff_array, 0)
+    # Difference (year2 - year1), vegetation loss (negative changes),
+    # vegetation gain (positive changes) and change magnitude
+    diff_array, loss_array, gain_array, heatmap_array = compute_changes(ndvi1, ndvi2, buffers)
     
-    # Save vegetation loss map (simulated)
-    loss_path = os.path.join(output_dir, f"loss_{year1}_{year2}.tif")
-    with open(loss_path, 'w') as f:
-        f.write(f"Simulated vegetation loss map for {year1}-{year2}")
+    # Save vegetation loss map
+    loss_path = output_dir / f"loss_{year1}_{year2}.tif"
+    save_geotiff(loss_path, loss_array)
     
-    # Save vegetation gain map (simulated)
-    gain_path = os.path.join(output_dir, f"gain_{year1}_{year2}.tif")
-    with open(gain_path, 'w') as f:
-        f.write(f"Simulated vegetation gain map for {year1}-{year2}")
+    # Save vegetation gain map
+    gain_path = output_dir / f"gain_{year1}_{year2}.tif"
+    save_geotiff(gain_path, gain_array)
     
-    # Save change heatmap (simulated)
-    heatmap_path = os.path.join(output_dir, f"change_heatmap_{year1}_{year2}.tif")
-    with open(heatmap_path, 'w') as f:
-        f.write(f"Simulated change heatmap for {year1}-{year2}")
+    # Save change heatmap
+    heatmap_path = output_dir / f"change_heatmap_{year1}_{year2}.tif"
+    save_geotiff(heatmap_path, heatmap_array)
     
     # Save PNG visualizations (simulated)
-    loss_png = os.path.join(output_dir, f"loss_{year1}_{year2}.png")
+    loss_png = output_dir / f"loss_{year1}_{year2}.png"
     with open(loss_png, 'w') as f:
         f.write(f"Simulated vegetation loss PNG for {year1}-{year2}")
     
-    gain_png = os.path.join(output_dir, f"gain_{year1}_{year2}.png")
+    gain_png = output_dir / f"gain_{year1}_{year2}.png"
     with open(gain_png, 'w') as f:
         f.write(f"Simulated vegetation gain PNG for {year1}-{year2}")
     
-    heatmap_png = os.path.join(output_dir, f"change_heatmap_{year1}_{year2}.png")
+    heatmap_png = output_dir / f"change_heatmap_{year1}_{year2}.png"
     with open(heatmap_png, 'w') as f:
         f.write(f"Simulated change heatmap PNG for {year1}-{year2}")
     
     logging.info(f"Saved change detection outputs for {year1}-{year2} to {output_dir}")
 
 if __name__ == "__main__":
+    ensure_output_dirs()
     detect_changes()
\ No newline at end of file
@@ -2,9 +2,8 @@
 Data preprocessing module for EnviroScan system.
 Handles downloading and preprocessing of satellite imagery.
 """
-import os
 import logging
-from utils import get_study_area_bounds, get_analysis_years
+from utils import ensure_output_dirs, get_study_area_bounds, get_analysis_years
 
 def preprocess_satellite_data():
     """
@@ -40,9 +39,6 @@ def preprocess_satellite_data():
     
     try:
         # Simulate data preprocessing
-        data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'satellite')
-        os.makedirs(data_dir, exist_ok=True)
-        
         for year in years:
             # Simulate downloading and preprocessing for each year
             logging.info(f"Processing data for year {year}")
@@ -57,4 +53,5 @@ def preprocess_satellite_data():
         raise
 
 if __name__ == "__main__":
+    ensure_output_dirs()
     preprocess_satellite_data()
\ No newline at end of file
@@ -2,13 +2,12 @@
 Land cover classification module for EnviroScan system.
 Uses machine learning to classify land cover types.
 """
-import os
 import logging
-import joblib
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from utils import get_analysis_years
+from utils import (
+    CLASSIFICATION_MAPS_DIR, MODELS_DIR, FEATURE_BANDS, ensure_output_dirs, get_analysis_years, get_raster_shape, get_rng,
+    run_in_process_pool, save_geotiff
+)
 
 def classify_land_cover():
     """
@@ -16,7 +15,7 @@ def classify_land_cover():
     
     This function:
     1. Extracts pixel features
-    2. Trains Random Forest model
+    2. Trains Histogram Gradient Boosting model
     3. Saves model to /models
     4. Produces classified map
     """
@@ -26,37 +25,16 @@ def classify_land_cover():
     years = get_analysis_years()
     
     try:
-        # Create output directories
-        classification_maps_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-            'output', 'classification_maps'
-        )
-        os.makedirs(classification_maps_dir, exist_ok=True)
-        
-        # Create models directory
-        models_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
-        os.makedirs(models_dir, exist_ok=True)
-        
         # Train model (in practice, this would use actual satellite data)
         model = train_land_cover_model()
         
         # Save trained model
-        model_path = os.path.join(models_dir, 'random_forest_model.pkl')
-        joblib.dump(model, model_path)
+        model_path = MODELS_DIR / 'land_cover_model.pkl'
+        save_land_cover_model(model, model_path)
         logging.info(f"Saved trained model to {model_path}")
         
-        for year in years:
-            logging.info(f"Classifying land cover for year {year}")
-            
-            # In practice, this would:
-            # 1. Load the preprocessed satellite imagery for the year
-            # 2. Extract features for each pixel
-            # 3. Apply the trained model to classify each pixel
-            # 4. Save classified map as GeoTIFF
-            # 5. Generate visualization
-            
-            # Simulate land cover classification
-            simulate_land_cover_classification(year, classification_maps_dir)
+        # Years are independent, so classify them in parallel
+        run_in_process_pool(_process_year, years, CLASSIFICATION_MAPS_DIR)
             
         logging.info("Land cover classification completed")
         
@@ -64,30 +42,71 @@ def classify_land_cover():
         logging.error(f"Error in land cover classification: {str(e)}")
         raise
 
-def train_land_cover_model():
+def _process_year(year, output_dir):
     """
-    Train a Random Forest model for land cover classification.
+    Classify land cover for a single year in a worker process.
+    
+    Args:
+        year (int): Year to process
+        output_dir (Path): Directory to save outputs
+    """
+    logging.info(f"Classifying land cover for year {year}")
+    
+    # In practice, this would:
+    # 1. Load the preprocessed satellite imagery for the year
+    # 2. Extract features for each pixel
+    # 3. Apply the trained model to classify each pixel
+    # 4. Save classified map as GeoTIFF
+    # 5. Generate visualization
+    
+    # Simulate land cover classification
+    simulate_land_cover_classification(year, output_dir)
+
+def train_land_cover_model(bands=None, labels=None):
+    """
+    Train a Histogram Gradient Boosting model for land cover classification.
+    
+    Features are binned into at most 255 histogram bins, which keeps split
+    finding fast on millions of pixels.
+    
+    Args:
+        bands (np.ndarray, optional): Band-major training features of shape
+            (len(FEATURE_BANDS), n_pixels) or (len(FEATURE_BANDS), height, width)
+        labels (np.ndarray, optional): Class label for each pixel
     
     Returns:
-        RandomForestClassifier: Trained model
+        HistGradientBoostingClassifier: Trained model
     """
-    logging.info("Training Random Forest model for land cover classification")
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.model_selection import train_test_split
+    
+    logging.info("Training Histogram Gradient Boosting model for land cover classification")
     
     # In practice, this would use actual training data
     # For simulation, we'll create a simple model
+    rng = get_rng()
+    if bands is None:
+        # Features: [NIR, Red, Green, Blue, NDVI, elevation]
+        bands = rng.random((len(FEATURE_BANDS), 1000), dtype=np.float32)
     
-    # Create simulated training data
-    # Features: [NIR, Red, Green, Blue, NDVI, elevation]
-    X = np.random.rand(1000, 6)
+    if labels is None:
+        # Labels: 0=Forest, 1=Water, 2=Urban, 3=Agriculture
+        labels = rng.integers(0, 4, size=bands[0].size, dtype=np.uint8)
     
-    # Labels: 0=Forest, 1=Water, 2=Urban, 3=Agriculture
-    y = np.random.choice([0, 1, 2, 3], size=1000)
+    # scikit-learn expects (n_samples, n_features)
+    X = bands.reshape(len(bands), -1).T
+    y = np.ravel(labels)
     
     # Split data
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     
     # Train model
-    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    model = HistGradientBoostingClassifier(
+        max_bins=255,
+        max_iter=200,
+        early_stopping=True,
+        random_state=42
+    )
     model.fit(X_train, y_train)
     
     # Log accuracy (simulated)
@@ -96,27 +115,75 @@ def train_land_cover_model():
     
     return model
 
+def save_land_cover_model(model, model_path):
+    """
+    Save a trained model with LZ4 compression.
+    
+    LZ4 keeps compression and decompression cheap. Pickle protocol 5 is
+    passed through to joblib, which writes NumPy arrays in its own format
+    either way.
+    
+    Args:
+        model: Trained land cover model
+        model_path (Path): Destination file
+    """
+    import joblib
+    
+    joblib.dump(model, model_path, compress=('lz4', 3), protocol=5)
+
+def load_land_cover_model(model_path=MODELS_DIR / 'land_cover_model.pkl'):
+    """
+    Load a model saved by save_land_cover_model.
+    
+    Args:
+        model_path (Path): Model file
+    
+    Returns:
+        Trained land cover model
+    """
+    import joblib
+    
+    return joblib.load(model_path)
+
+def predict_land_cover(model, bands, chunk_size=1_000_000):
+    """
+    Classify every pixel of a feature raster in chunks.
+    
+    Args:
+        model: Trained land cover model
+        bands (np.ndarray): Band-major feature raster of shape (n_bands, height, width)
+        chunk_size (int): Number of pixels predicted per call
+    
+    Returns:
+        np.ndarray: uint8 class raster of shape (height, width)
+    """
+    n_bands, height, width = bands.shape
+    X = bands.reshape(n_bands, -1).T
+    classes = np.empty(X.shape[0], dtype=np.uint8)
+    
+    for start in range(0, X.shape[0], chunk_size):
+        classes[start:start + chunk_size] = model.predict(X[start:start + chunk_size])
+    
+    return classes.reshape(height, width)
+
 def simulate_land_cover_classification(year, output_dir):
     """
     Simulate land cover classification for a given year.
     
     Args:
         year (int): Year to process
-        output_dir (str): Directory to save outputs
+        output_dir (Path): Directory to save outputs
     """
     # Create a simulated classification array
     # Class labels: 0=Forest, 1=Water, 2=Urban, 3=Agriculture
-    classification_array = np.random.choice([0, 1, 2, 3], size=(100, 100))
+    classification_array = get_rng(year).integers(0, 4, size=get_raster_shape(), dtype=np.uint8)
     
-    # Save as GeoTIFF (simulated)
-    tiff_path = os.path.join(output_dir, f"classification_{year}.tif")
-    # In practice, you would use rasterio to save the array as a GeoTIFF
-    # For now, we'll just create an empty file to represent the output
-    with open(tiff_path, 'w') as f:
-        f.write(f"Simulated land cover classification GeoTIFF for {year}")
+    # Save as GeoTIFF (class labels use mode resampling for overviews)
+    tiff_path = output_dir / f"classification_{year}.tif"
+    save_geotiff(tiff_path, classification_array, resampling='mode')
     
     # Save as PNG visualization (simulated)
-    png_path = os.path.join(output_dir, f"classification_{year}.png")
+    png_path = output_dir / f"classification_{year}.png"
     # In practice, you would use matplotlib to create a visualization
     # For now, we'll just create an empty file to represent the output
     with open(png_path, 'w') as f:
@@ -125,4 +192,5 @@ def simulate_land_cover_classification(year, output_dir):
     logging.info(f"Saved classification outputs for {year} to {output_dir}")
 
 if __name__ == "__main__":
+    ensure_output_dirs()
     classify_land_cover()
\ No newline at end of file
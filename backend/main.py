@@ -15,10 +15,13 @@ from ndvi import calculate_ndvi
 from land_classification import classify_land_cover
 from change_detection import detect_changes
 from species_mapping import map_species_data
-from utils import setup_logging, authenticate_gee
+from utils import ensure_output_dirs, setup_logging, authenticate_gee
 
 def main():
     """Main function to run the EnviroScan system."""
+    # Create output directories
+    ensure_output_dirs()
+    
     # Setup logging
     setup_logging()
     logging.info("Starting EnviroScan biodiversity monitoring system")
@@ -2,10 +2,132 @@
 NDVI calculation module for EnviroScan system.
 Implements NDVI computation and visualization.
 """
-import os
 import logging
+from functools import lru_cache
 import numpy as np
-from utils import get_analysis_years
+from numba import njit, prange
+from utils import (
+    NDVI_MAPS_DIR, NIR_IDX, RED_IDX,
+    ensure_output_dirs, fill_uniform, get_analysis_years, get_raster_shape, get_rng,
+    iter_row_strips, open_scratch_raster, run_in_process_pool, save_geotiff
+)
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _ndvi_kernel_jit(nir, red, out):
+    """
+    Compute NDVI element-wise over flat float32 band arrays.
+
+    Pixels where NIR + Red is zero are set to 0.
+
+    Args:
+        nir (np.ndarray): Flat NIR band
+        red (np.ndarray): Flat Red band
+        out (np.ndarray): Flat output array, written in place
+    """
+    for i in prange(nir.size):
+        d = nir[i] + red[i]
+        if d != 0:
+            out[i] = (nir[i] - red[i]) / d
+        else:
+            out[i] = 0.0
+
+@njit(parallel=True, cache=True)
+def _tile_stats_jit(values):
+    """
+    Compute summary statistics of a flat float32 array in a single pass.
+
+    NaN values are skipped (fastmath is not used, as it would assume no NaNs).
+
+    Args:
+        values (np.ndarray): Flat array
+
+    Returns:
+        tuple: (sum, sum of squares, min, max, count of valid values)
+    """
+    s = 0.0
+    s2 = 0.0
+    mn = np.inf
+    mx = -np.inf
+    n = 0
+    for i in prange(values.size):
+        x = values[i]
+        if x == x:
+            s += x
+            s2 += x * x
+            mn = min(mn, x)
+            mx = max(mx, x)
+            n += 1
+    return s, s2, mn, mx, n
+
+try:
+    # Ahead-of-time compiled kernels, built by _kernels_build.py
+    from enviroscan_kernels import ndvi_f32 as _ndvi_kernel
+    from enviroscan_kernels import tile_stats_f32 as _tile_stats
+except ImportError:
+    _ndvi_kernel = _ndvi_kernel_jit
+    _tile_stats = _tile_stats_jit
+
+def compute_ndvi(bands, out=None, tile_stats=None):
+    """
+    Compute NDVI from the NIR and Red bands, one strip of rows at a time.
+
+    Args:
+        bands (np.ndarray): Band-major feature stack of shape (n_bands, height, width)
+        out (np.ndarray, optional): Pre-allocated float32 output array
+        tile_stats (list, optional): If given, statistics of each strip are
+            appended while the strip is still in cache (see summarize_tile_stats)
+
+    Returns:
+        np.ndarray: NDVI raster of shape (height, width)
+    """
+    nir = np.ascontiguousarray(bands[NIR_IDX], dtype=np.float32)
+    red = np.ascontiguousarray(bands[RED_IDX], dtype=np.float32)
+    if out is None:
+        out = np.empty(nir.shape, dtype=np.float32)
+    for rows in iter_row_strips(nir.shape[0]):
+        _ndvi_kernel(nir[rows].ravel(), red[rows].ravel(), out[rows].reshape(-1))
+        if tile_stats is not None:
+            tile_stats.append(_tile_stats(out[rows].reshape(-1)))
+    return out
+
+def summarize_tile_stats(tile_stats):
+    """
+    Combine per-strip statistics into summary statistics for the whole raster.
+
+    Args:
+        tile_stats (list): (sum, sum of squares, min, max, count) tuples
+
+    Returns:
+        dict: mean, std, min, max and count of valid values
+    """
+    s, s2, mn, mx, n = (np.array(column) for column in zip(*tile_stats))
+    count = int(n.sum())
+    mean = s.sum() / count
+    variance = max(s2.sum() / count - mean * mean, 0.0)
+    return {
+        'mean': mean,
+        'std': np.sqrt(variance),
+        'min': mn.min(),
+        'max': mx.max(),
+        'count': count
+    }
+
+@lru_cache(maxsize=None)
+def _get_buffers(shape, dtype=np.float32):
+    """
+    Get a band-major input stack, allocated once per shape.
+    
+    Only the leading bands up to NIR and Red are allocated, as those are the
+    only bands NDVI reads; they are fully overwritten for every year.
+    
+    Args:
+        shape (tuple): Raster shape
+        dtype (type): Buffer dtype
+    
+    Returns:
+        np.ndarray: Array of shape (n_bands, height, width), indexed by NIR_IDX and RED_IDX
+    """
+    return np.empty((max(NIR_IDX, RED_IDX) + 1,) + shape, dtype=dtype)
 
 def calculate_ndvi():
     """
@@ -23,22 +145,8 @@ def calculate_ndvi():
     years = get_analysis_years()
     
     try:
-        # Create output directories
-        ndvi_maps_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output', 'ndvi_maps')
-        os.makedirs(ndvi_maps_dir, exist_ok=True)
-        
-        for year in years:
-            logging.info(f"Calculating NDVI for year {year}")
-            
-            # In practice, this would:
-            # 1. Load the preprocessed satellite imagery for the year
-            # 2. Extract NIR and Red bands
-            # 3. Apply the NDVI formula
-            # 4. Save as GeoTIFF
-            # 5. Generate PNG visualization
-            
-            # Simulate NDVI calculation
-            simulate_ndvi_calculation(year, ndvi_maps_dir)
+        # Years are independent, so process them in parallel
+        run_in_process_pool(_process_year, years, NDVI_MAPS_DIR, initializer=_init_worker)
             
         logging.info("NDVI calculation completed")
         
@@ -46,33 +154,78 @@ def calculate_ndvi():
         logging.error(f"Error in NDVI calculation: {str(e)}")
         raise
 
+def _init_worker():
+    """Load the compiled NDVI kernel once per worker process."""
+    buffer = np.zeros(1, dtype=np.float32)
+    _ndvi_kernel(buffer, buffer, buffer)
+    _tile_stats(buffer)
+
+def _process_year(year, output_dir):
+    """
+    Calculate NDVI for a single year in a worker process.
+    
+    Args:
+        year (int): Year to process
+        output_dir (Path): Directory to save outputs
+    """
+    logging.info(f"Calculating NDVI for year {year}")
+    
+    # In practice, this would:
+    # 1. Load the preprocessed satellite imagery for the year
+    # 2. Extract NIR and Red bands
+    # 3. Apply the NDVI formula
+    # 4. Save as GeoTIFF
+    # 5. Generate PNG visualization
+    
+    # Simulate NDVI calculation
+    simulate_ndvi_calculation(year, output_dir)
+
 def simulate_ndvi_calculation(year, output_dir):
     """
     Simulate NDVI calculation for a given year.
     
     Args:
         year (int): Year to process
-        output_dir (str): Directory to save outputs
+        output_dir (Path): Directory to save outputs
+    
+    Returns:
+        np.memmap: NDVI raster, memory-mapped from PROCESSED_DIR for later steps
     """
-    # Create a simulated NDVI array (in practice, this would be calculated from actual satellite data)
-    # NDVI values typically range from -1 to 1
-    ndvi_array = np.random.uniform(-1, 1, (100, 100))
+    bands = _get_buffers(get_raster_shape())
     
-    # Save as GeoTIFF (simulated)
-    tiff_path = os.path.join(output_dir, f"ndvi_{year}.tif")
-    # In practice, you would use rasterio to save the array as a GeoTIFF
-    # For now, we'll just create an empty file to represent the output
-    with open(tiff_path, 'w') as f:
-        f.write(f"Simulated NDVI GeoTIFF for {year}")
+    # Create simulated NIR and Red reflectance bands (in practice, these would be loaded from satellite data)
+    rng = get_rng(year)
+    fill_uniform(rng, bands[NIR_IDX])
+    fill_uniform(rng, bands[RED_IDX])
+    
+    # NDVI values range from -1 to 1, written to a memory-mapped raster
+    # that change detection reads back
+    ndvi_array = open_scratch_raster(f"ndvi_{year}.dat", mode='w+')
+    tile_stats = []
+    compute_ndvi(bands, out=ndvi_array, tile_stats=tile_stats)
+    ndvi_array.flush()
+    
+    stats = summarize_tile_stats(tile_stats)
+    logging.info(
+        f"NDVI {year}: mean={stats['mean']:.3f}, std={stats['std']:.3f}, "
+        f"min={stats['min']:.3f}, max={stats['max']:.3f}"
+    )
+    
+    # Save as GeoTIFF
+    tiff_path = output_dir / f"ndvi_{year}.tif"
+    save_geotiff(tiff_path, ndvi_array)
     
     # Save as PNG visualization (simulated)
-    png_path = os.path.join(output_dir, f"ndvi_{year}.png")
+    png_path = output_dir / f"ndvi_{year}.png"
     # In practice, you would use matplotlib to create a visualization
     # For now, we'll just create an empty file to represent the output
     with open(png_path, 'w') as f:
         f.write(f"Simulated NDVI PNG visualization for {year}")
     
     logging.info(f"Saved NDVI outputs for {year} to {output_dir}")
+    
+    return ndvi_array
 
 if __name__ == "__main__":
+    ensure_output_dirs()
     calculate_ndvi()
\ No newline at end of file
@@ -2,11 +2,15 @@
 Species mapping module for EnviroScan system.
 Integrates biodiversity species data with environmental data.
 """
-import os
 import logging
-import pandas as pd
 import numpy as np
-from utils import get_study_area_bounds
+from utils import (
+    OUTPUT_DIR, SPECIES_DIR, ensure_output_dirs, get_raster_shape,
+    get_study_area_bounds, save_geotiff
+)
+
+# Search radius (degrees) used to count nearby observations for hotspots
+HOTSPOT_RADIUS = 0.05
 
 def map_species_data():
     """
@@ -21,20 +25,6 @@ def map_species_data():
     logging.info("Starting species data mapping")
     
     try:
-        # Create species data directory if it doesn't exist
-        species_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-            'data', 'species'
-        )
-        os.makedirs(species_dir, exist_ok=True)
-        
-        # Create output directory
-        output_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-            'output'
-        )
-        os.makedirs(output_dir, exist_ok=True)
-        
         # In practice, this would:
         # 1. Load GBIF CSV file
         # 2. Load eBird Observations CSV
@@ -45,7 +35,7 @@ def map_species_data():
         # 7. Save outputs
         
         # Simulate species mapping
-        simulate_species_mapping(species_dir, output_dir)
+        simulate_species_mapping(SPECIES_DIR, OUTPUT_DIR)
         
         logging.info("Species data mapping completed")
         
@@ -53,13 +43,116 @@ def map_species_data():
         logging.error(f"Error in species data mapping: {str(e)}")
         raise
 
+def save_observations(data, csv_path):
+    """
+    Save species observations as CSV and as a ZSTD-compressed Parquet file alongside it.
+    
+    Args:
+        data (dict): Column name to list of values
+        csv_path (Path): Path of the CSV file; the Parquet file uses the same name
+    
+    Returns:
+        Path: Path of the Parquet file
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+    import pyarrow.parquet as pq
+    
+    table = pa.Table.from_pydict(data)
+    pcsv.write_csv(table, csv_path)
+    
+    parquet_path = csv_path.with_suffix('.parquet')
+    pq.write_table(table, parquet_path, compression='zstd')
+    
+    return parquet_path
+
+def load_observation_coordinates(parquet_paths):
+    """
+    Load observation coordinates from Parquet files, reading only the coordinate columns.
+    
+    Args:
+        parquet_paths (list): Parquet files to read
+    
+    Returns:
+        tuple: (longitudes, latitudes) as float64 arrays
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    tables = [pq.read_table(path, columns=['longitude', 'latitude']) for path in parquet_paths]
+    table = pa.concat_tables(tables)
+    return table['longitude'].to_numpy(), table['latitude'].to_numpy()
+
+def _grid_edges(shape):
+    """
+    Get cell edges of the study area raster.
+    
+    Args:
+        shape (tuple): Raster shape (height, width)
+    
+    Returns:
+        tuple: (lon_edges, lat_edges), latitude edges ordered north to south
+    """
+    min_lon, min_lat, max_lon, max_lat = get_study_area_bounds()
+    height, width = shape
+    lon_edges = np.linspace(min_lon, max_lon, width + 1)
+    lat_edges = np.linspace(max_lat, min_lat, height + 1)
+    return lon_edges, lat_edges
+
+def count_observations_per_cell(longitudes, latitudes, shape):
+    """
+    Count observations falling in each cell of the study area raster.
+    
+    Args:
+        longitudes (np.ndarray): Observation longitudes
+        latitudes (np.ndarray): Observation latitudes
+        shape (tuple): Raster shape (height, width)
+    
+    Returns:
+        np.ndarray: uint32 count raster, north-up
+    """
+    lon_edges, lat_edges = _grid_edges(shape)
+    counts, _, _ = np.histogram2d(latitudes, longitudes, bins=[lat_edges[::-1], lon_edges])
+    return counts[::-1].astype(np.uint32)
+
+def identify_hotspots(longitudes, latitudes, shape, radius=HOTSPOT_RADIUS):
+    """
+    Count observations within a radius of every cell centre of the study area raster.
+    
+    The observations are indexed once in a KD-tree, so each cell is an
+    O(log N) query instead of a scan over all observations.
+    
+    Args:
+        longitudes (np.ndarray): Observation longitudes
+        latitudes (np.ndarray): Observation latitudes
+        shape (tuple): Raster shape (height, width)
+        radius (float): Search radius in degrees
+    
+    Returns:
+        np.ndarray: uint32 raster of nearby observation counts, north-up
+    """
+    from scipy.spatial import cKDTree
+    
+    lon_edges, lat_edges = _grid_edges(shape)
+    lon_centers = (lon_edges[:-1] + lon_edges[1:]) / 2
+    lat_centers = (lat_edges[:-1] + lat_edges[1:]) / 2
+    grid_lon, grid_lat = np.meshgrid(lon_centers, lat_centers)
+    
+    tree = cKDTree(np.column_stack([longitudes, latitudes]))
+    counts = tree.query_ball_point(
+        np.column_stack([grid_lon.ravel(), grid_lat.ravel()]),
+        r=radius,
+        return_length=True
+    )
+    return counts.reshape(shape).astype(np.uint32)
+
 def simulate_species_mapping(species_dir, output_dir):
     """
     Simulate species mapping process.
     
     Args:
-        species_dir (str): Directory containing species data
-        output_dir (str): Directory to save outputs
+        species_dir (Path): Directory containing species data
+        output_dir (Path): Directory to save outputs
     """
     # Create simulated species data (GBIF format)
     gbif_data = {
@@ -69,11 +162,9 @@ def simulate_species_mapping(species_dir, output_dir):
         'date': ['2020-01-15', '2020-02-20', '2020-03-10', '2020-04-05', '2020-05-12']
     }
     
-    gbif_df = pd.DataFrame(gbif_data)
-    
     # Save simulated GBIF data
-    gbif_path = os.path.join(species_dir, 'gbif_species.csv')
-    gbif_df.to_csv(gbif_path, index=False)
+    gbif_path = species_dir / 'gbif_species.csv'
+    gbif_parquet = save_observations(gbif_data, gbif_path)
     
     # Create simulated eBird data
     ebird_data = {
@@ -83,19 +174,27 @@ def simulate_species_mapping(species_dir, output_dir):
         'date': ['2020-01-10', '2020-02-15', '2020-03-05', '2020-04-20', '2020-05-30']
     }
     
-    ebird_df = pd.DataFrame(ebird_data)
-    
     # Save simulated eBird data
-    ebird_path = os.path.join(species_dir, 'ebird_observations.csv')
-    ebird_df.to_csv(ebird_path, index=False)
+    ebird_path = species_dir / 'ebird_observations.csv'
+    ebird_parquet = save_observations(ebird_data, ebird_path)
+    
+    # Grid observations over the study area
+    longitudes, latitudes = load_observation_coordinates([gbif_parquet, ebird_parquet])
+    shape = get_raster_shape()
+    
+    species_counts = count_observations_per_cell(longitudes, latitudes, shape)
+    save_geotiff(output_dir / 'species_distribution.tif', species_counts, resampling='nearest')
+    
+    hotspots = identify_hotspots(longitudes, latitudes, shape)
+    save_geotiff(output_dir / 'biodiversity_hotspots.tif', hotspots, resampling='nearest')
     
     # Create species distribution map (simulated)
-    species_map_path = os.path.join(output_dir, 'species_distribution.png')
+    species_map_path = output_dir / 'species_distribution.png'
     with open(species_map_path, 'w') as f:
         f.write("Simulated species distribution map")
     
     # Create biodiversity hotspot map (simulated)
-    hotspot_map_path = os.path.join(output_dir, 'biodiversity_hotspots.png')
+    hotspot_map_path = output_dir / 'biodiversity_hotspots.png'
     with open(hotspot_map_path, 'w') as f:
         f.write("Simulated biodiversity hotspot map")
     
@@ -103,4 +202,5 @@ def simulate_species_mapping(species_dir, output_dir):
     logging.info(f"Created species mapping outputs: {species_map_path}, {hotspot_map_path}")
 
 if __name__ == "__main__":
+    ensure_output_dirs()
     map_species_data()
\ No newline at end of file
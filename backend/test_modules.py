@@ -14,10 +14,13 @@ from ndvi import calculate_ndvi
 from land_classification import classify_land_cover
 from change_detection import detect_changes
 from species_mapping import map_species_data
-from utils import setup_logging
+from utils import ensure_output_dirs, setup_logging
 
 def test_modules():
     """Test all modules without GEE authentication."""
+    # Create output directories
+    ensure_output_dirs()
+    
     # Setup logging
     setup_logging()
     logging.info("Testing EnviroScan modules without GEE authentication")
@@ -2,32 +2,136 @@
 Utility functions for the EnviroScan system.
 """
 import os
+import atexit
 import logging
+import logging.handlers
+import multiprocessing
 from datetime import datetime
+from pathlib import Path
+import numpy as np
+
+# Project directories
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / 'data'
+OUTPUT_DIR = PROJECT_ROOT / 'output'
+MODELS_DIR = PROJECT_ROOT / 'models'
+LOGS_DIR = PROJECT_ROOT / 'logs'
+SATELLITE_DIR = DATA_DIR / 'satellite'
+SPECIES_DIR = DATA_DIR / 'species'
+NDVI_MAPS_DIR = OUTPUT_DIR / 'ndvi_maps'
+CLASSIFICATION_MAPS_DIR = OUTPUT_DIR / 'classification_maps'
+CHANGE_MAPS_DIR = OUTPUT_DIR / 'change_maps'
+
+# Memory-mapped intermediate rasters shared between processing steps
+PROCESSED_DIR = DATA_DIR / 'processed'
+
+_DIRS_READY = False
+
+# Earth Engine credentials cached by `earthengine authenticate`
+EE_CREDENTIALS_PATH = Path('~/.config/earthengine/credentials').expanduser()
+
+# High-volume Earth Engine endpoint for batch (non-interactive) workloads
+EE_HIGH_VOLUME_URL = 'https://earthengine-highvolume.googleapis.com'
+
+_EE_READY = False
+
+# Queue shared with worker processes; records are written by a listener thread
+_LOG_QUEUE = None
+
+# Internal tile size of GeoTIFF outputs
+GEOTIFF_BLOCK_SIZE = 256
+
+# Overview decimation factors built into GeoTIFF outputs
+GEOTIFF_OVERVIEW_LEVELS = [2, 4, 8, 16]
+
+# Base seed for simulated data
+RANDOM_SEED = 42
+
+# Per-pixel features, stored band-major as contiguous float32 bands[B, H, W]
+FEATURE_BANDS = ['nir', 'red', 'green', 'blue', 'ndvi', 'elevation']
+NIR_IDX = FEATURE_BANDS.index('nir')
+RED_IDX = FEATURE_BANDS.index('red')
+
+def ensure_output_dirs():
+    """Create all data, output, model and log directories once per process."""
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    
+    for directory in (
+        NDVI_MAPS_DIR, CLASSIFICATION_MAPS_DIR, CHANGE_MAPS_DIR,
+        SATELLITE_DIR, SPECIES_DIR, PROCESSED_DIR, MODELS_DIR, LOGS_DIR
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+    
+    _DIRS_READY = True
 
 def setup_logging():
-    """Setup logging configuration."""
-    log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'logs')
-    os.makedirs(log_dir, exist_ok=True)
+    """
+    Setup logging configuration.
+    
+    Log calls only enqueue records; a QueueListener thread formats them and
+    writes them to the log file and console. The queue is a multiprocessing
+    queue so that worker processes log through the same listener.
+    """
+    global _LOG_QUEUE
+    log_file = LOGS_DIR / f"enviroscan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    _LOG_QUEUE = multiprocessing.Queue(-1)
+    listener = logging.handlers.QueueListener(_LOG_QUEUE, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
     
-    log_file = os.path.join(log_dir, f"enviroscan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+    # The listener's handlers apply the full format
+    queue_handler = logging.handlers.QueueHandler(_LOG_QUEUE)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
     
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
-    )
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
     
     return logging.getLogger(__name__)
 
+def _init_worker_process(log_queue, n_workers, initializer):
+    """
+    Route worker logging to the parent's log queue and run the task initializer.
+    
+    The Numba thread pool of each worker is limited to its share of the CPUs,
+    so parallel kernels running in every worker at once do not oversubscribe
+    the machine.
+    
+    Args:
+        log_queue (multiprocessing.Queue): Queue from setup_logging, or None
+        n_workers (int): Number of worker processes in the pool
+        initializer (callable): Task-specific initializer, or None
+    """
+    import numba
+    numba.set_num_threads(max(1, (os.cpu_count() or 1) // n_workers))
+    
+    if log_queue is not None:
+        root = logging.getLogger()
+        root.handlers = [logging.handlers.QueueHandler(log_queue)]
+        root.setLevel(logging.INFO)
+    
+    if initializer is not None:
+        initializer()
+
 def authenticate_gee():
     """
     Authenticate with Google Earth Engine.
     This function would handle the authentication process with GEE.
+    
+    Cached credentials are reused without re-authenticating, Earth Engine
+    is initialized against the high-volume endpoint, and repeated calls in
+    the same process return immediately.
     """
+    global _EE_READY
+    if _EE_READY:
+        return
+    
     # Placeholder for GEE authentication
     # In practice, this would involve:
     # 1. Checking for existing credentials
@@ -35,8 +139,11 @@ def authenticate_gee():
     # 3. Initializing the Earth Engine library
     try:
         import ee
-        # ee.Authenticate()  # Uncomment for actual authentication
-        ee.Initialize()
+        if not EE_CREDENTIALS_PATH.exists():
+            logging.info(f"No cached Earth Engine credentials at {EE_CREDENTIALS_PATH}")
+            # ee.Authenticate()  # Uncomment for actual authentication
+        ee.Initialize(opt_url=EE_HIGH_VOLUME_URL)
+        _EE_READY = True
         logging.info("Successfully authenticated with Google Earth Engine")
     except ImportError:
         logging.warning("Earth Engine API not available. Running in simulation mode.")
@@ -44,6 +151,148 @@ def authenticate_gee():
         logging.error(f"Failed to authenticate with Google Earth Engine: {str(e)}")
         raise
 
+def get_rng(*keys):
+    """
+    Get a random generator for simulated data.
+    
+    The generator is seeded from RANDOM_SEED and the given keys (e.g. the
+    year), so results do not depend on which worker process runs a task.
+    
+    Args:
+        *keys (int): Extra seed values
+    
+    Returns:
+        np.random.Generator: Seeded generator
+    """
+    return np.random.default_rng((RANDOM_SEED,) + keys)
+
+def fill_uniform(rng, out, low=0.0, high=1.0):
+    """
+    Fill a float32 buffer in place with uniform random values in [low, high).
+    
+    Unlike Generator.uniform, nothing is allocated and no float64
+    intermediate is produced: values are drawn into out and scaled in place.
+    
+    Args:
+        rng (np.random.Generator): Random generator
+        out (np.ndarray): Contiguous float32 buffer to fill
+        low (float): Lower bound
+        high (float): Upper bound
+    
+    Returns:
+        np.ndarray: out
+    """
+    rng.random(out=out, dtype=np.float32)
+    if high - low != 1.0:
+        np.multiply(out, high - low, out=out)
+    if low != 0.0:
+        np.add(out, low, out=out)
+    return out
+
+def run_in_process_pool(func, items, *args, initializer=None):
+    """
+    Run func(item, *args) for every item in a pool of worker processes.
+    
+    Args:
+        func (callable): Module-level function to run
+        items (list): Items to process, one task each
+        *args: Extra arguments passed to every call
+        initializer (callable, optional): Called once in each worker on start-up
+    
+    Returns:
+        list: Results in the order of items
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import repeat
+    
+    max_workers = min(len(items), os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker_process,
+        initargs=(_LOG_QUEUE, max_workers, initializer)
+    ) as executor:
+        return list(executor.map(func, items, *(repeat(arg) for arg in args)))
+
+def open_scratch_raster(name, mode='r', dtype=np.float32, shape=None):
+    """
+    Open an intermediate raster in PROCESSED_DIR as a memory-mapped array.
+    
+    Only the pages that are touched are kept in memory, so full-scene
+    rasters can be produced and consumed strip by strip with bounded memory.
+    
+    Args:
+        name (str): File name inside PROCESSED_DIR
+        mode (str): np.memmap mode ('r' to read, 'w+' to create)
+        dtype (type): Raster dtype
+        shape (tuple, optional): Raster shape, defaults to get_raster_shape()
+    
+    Returns:
+        np.memmap: Memory-mapped raster
+    """
+    if shape is None:
+        shape = get_raster_shape()
+    return np.memmap(PROCESSED_DIR / name, dtype=dtype, mode=mode, shape=shape)
+
+def iter_row_strips(height, strip_height=GEOTIFF_BLOCK_SIZE):
+    """
+    Iterate over a raster in strips of rows.
+    
+    The default strip height matches the GeoTIFF block size so that strip
+    processing stays cache-resident and block-aligned with raster I/O.
+    
+    Args:
+        height (int): Number of raster rows
+        strip_height (int): Rows per strip
+    
+    Yields:
+        slice: Row slice for each strip
+    """
+    for y0 in range(0, height, strip_height):
+        yield slice(y0, min(y0 + strip_height, height))
+
+def save_geotiff(path, array, resampling='average'):
+    """
+    Save a single-band raster over the study area as a tiled GeoTIFF with overviews.
+    
+    Uses a Cloud-Optimized GeoTIFF style layout (internal tiling, ZSTD
+    compression, internal overviews) so that downstream readers can fetch
+    individual tiles instead of scanning the whole file.
+    
+    Args:
+        path (Path): Output file path
+        array (np.ndarray): 2-D raster to save
+        resampling (str): Resampling method used to build overviews
+    """
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.transform import from_bounds
+    
+    height, width = array.shape
+    transform = from_bounds(*get_study_area_bounds(), width, height)
+    # Floating point predictor for continuous rasters, horizontal differencing otherwise
+    predictor = 3 if np.issubdtype(array.dtype, np.floating) else 2
+    
+    with rasterio.open(
+        path, 'w',
+        driver='GTiff',
+        height=height,
+        width=width,
+        count=1,
+        dtype=array.dtype,
+        crs='EPSG:4326',
+        transform=transform,
+        tiled=True,
+        blockxsize=GEOTIFF_BLOCK_SIZE,
+        blockysize=GEOTIFF_BLOCK_SIZE,
+        compress='ZSTD',
+        zstd_level=8,
+        predictor=predictor,
+        BIGTIFF='YES'
+    ) as dst:
+        dst.write(array, 1)
+        dst.build_overviews(GEOTIFF_OVERVIEW_LEVELS, Resampling[resampling])
+        dst.update_tags(ns='rio_overview', resampling=resampling)
+
 def get_study_area_bounds():
     """
     Get the bounding box coordinates for Jim Corbett National Park.
@@ -53,6 +302,15 @@ def get_study_area_bounds():
     """
     return [78.56, 29.29, 79.15, 29.63]
 
+def get_raster_shape():
+    """
+    Get the shape of the rasters produced for the study area.
+    
+    Returns:
+        tuple: (height, width) in pixels
+    """
+    return (100, 100)
+
 def get_analysis_years():
     """
     Get the years to analyze.
@@ -2,14 +2,59 @@
 Streamlit dashboard for EnviroScan system.
 Displays NDVI maps, land cover classification, change detection heatmaps, and species distribution.
 """
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode
+
+# GDAL settings for COG reads, set before rasterio is imported. GDAL falls back
+# to the process environment for config options, so these apply process-wide:
+# to every session thread and prefetch thread, and to the GDAL block cache and
+# VSI cache they all share. rasterio.Env is thread-local and would not.
+for _key, _value in {
+    'GDAL_CACHEMAX': '512',
+    'VSI_CACHE': 'TRUE',
+    'VSI_CACHE_SIZE': '5000000',
+    'GDAL_DISABLE_READDIR_ON_OPEN': 'EMPTY_DIR',
+    'CPL_VSIL_CURL_ALLOWED_EXTENSIONS': '.tif',
+    'GDAL_HTTP_MULTIPLEX': 'YES',
+    'GDAL_HTTP_MERGE_CONSECUTIVE_RANGES': 'YES',
+    'AWS_NO_SIGN_REQUEST': 'YES',
+}.items():
+    os.environ.setdefault(_key, _value)
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
-import plotly.express as px
-import folium
-from streamlit_folium import st_folium
+
+# Optional TiTiler endpoint and the base URL where the output COGs are published.
+# When both are set, rasters are shown as tiled map overlays instead of figures.
+TILER_URL = os.environ.get('ENVIROSCAN_TILER_URL')
+COG_BASE_URL = os.environ.get('ENVIROSCAN_COG_BASE_URL')
+
+# Local output directory written by the backend, used when no COG URL is set
+OUTPUT_DIR = Path(__file__).resolve().parent.parent / 'output'
+
+# Land cover tile pyramids pre-rendered by backend/build_tiles.py, served as app/static/tiles
+STATIC_TILES_DIR = Path(__file__).resolve().parent / 'static' / 'tiles'
+
+# Species observation CSVs and the number of rows shown in the observations table
+SPECIES_DIR = Path(__file__).resolve().parent.parent / 'data' / 'species'
+SPECIES_TABLE_ROWS = 50
+
+# Study area bounds: [min_lon, min_lat, max_lon, max_lat]
+STUDY_AREA_BOUNDS = (78.56, 29.29, 79.15, 29.63)
+
+# Names and display colors of the land cover classes, indexed by class value
+LAND_COVER_LABELS = np.array(['Forest', 'Water', 'Urban', 'Agriculture'])
+LAND_COVER_COLORS = ['green', 'blue', 'gray', 'yellow']
+
+# Largest raster side sent to the figure; bigger rasters are decimated first
+DISPLAY_MAX_SIDE = 1024
+
+# RGB color of NaN (nodata) NDVI pixels
+NDVI_NODATA_RGB = (255, 255, 255)
 
 # Set page configuration
 st.set_page_config(
@@ -18,6 +63,362 @@ st.set_page_config(
     layout="wide"
 )
 
+def _downsample(arr, max_side=DISPLAY_MAX_SIDE):
+    """Stride-decimate a raster so its longest side fits within max_side pixels."""
+    step = max(1, -(-max(arr.shape[:2]) // max_side))
+    return arr[::step, ::step]
+
+def _apply_ndvi_lut(ndvi, lut, out):
+    """Quantize NDVI in [-1, 1] to 256 levels and gather RGB colors from a LUT."""
+    # Serial on purpose: Streamlit calls this from its session threads, where
+    # parallel kernels can abort or hang depending on Numba's threading layer.
+    # nogil lets those threads, and the prefetch pool, colormap concurrently.
+    flat = ndvi.ravel()
+    rgb = out.reshape(flat.size, 3)
+    for i in range(flat.size):
+        x = flat[i]
+        if x != x:
+            # NaN has no LUT index (and Numba does not bounds-check lut[idx])
+            rgb[i, 0] = NDVI_NODATA_RGB[0]
+            rgb[i, 1] = NDVI_NODATA_RGB[1]
+            rgb[i, 2] = NDVI_NODATA_RGB[2]
+            continue
+        idx = min(int((min(max(x, -1.0), 1.0) + 1.0) * 128.0), 255)
+        rgb[i, 0] = lut[idx, 0]
+        rgb[i, 1] = lut[idx, 1]
+        rgb[i, 2] = lut[idx, 2]
+    return out
+
+@st.cache_resource(show_spinner=False)
+def _ndvi_lut_kernel():
+    """_apply_ndvi_lut compiled with Numba, which is only imported on first use."""
+    from numba import njit
+    
+    # No fastmath: it would let LLVM assume there are no NaN pixels
+    return njit(nogil=True, cache=True)(_apply_ndvi_lut)
+
+def _stats(a):
+    """Mean, min, max and standard deviation of an array in a single pass, skipping NaN."""
+    flat = a.ravel()
+    s = 0.0
+    s2 = 0.0
+    mn = np.inf
+    mx = -np.inf
+    n = 0
+    for i in range(flat.size):
+        v = flat[i]
+        if v == v:
+            s += v
+            s2 += v * v
+            mn = min(mn, v)
+            mx = max(mx, v)
+            n += 1
+    if n == 0:
+        return np.nan, np.nan, np.nan, np.nan
+    mean = s / n
+    return mean, mn, mx, np.sqrt(max(s2 / n - mean * mean, 0.0))
+
+@st.cache_resource(show_spinner=False)
+def _stats_kernel():
+    """_stats compiled with Numba on first use, like _ndvi_lut_kernel."""
+    from numba import njit
+    
+    return njit(nogil=True, cache=True)(_stats)
+
+@st.cache_data(show_spinner=False)
+def _ndvi(year):
+    """Simulated NDVI data for a year, generated once per year."""
+    # Stand-in used when the NDVI GeoTIFF for the year is not available
+    ndvi = np.random.default_rng(year).random((50, 50), dtype=np.float32)
+    ndvi *= 2
+    ndvi -= 1
+    return ndvi
+
+@st.cache_data(show_spinner=False)
+def load_ndvi(year, bounds=STUDY_AREA_BOUNDS):
+    """
+    Read the NDVI COG for a year over the given bounds with a windowed read.
+    
+    Only the window covering the bounds is read, at a resolution capped to
+    DISPLAY_MAX_SIDE so GDAL serves it from the nearest overview. Remote COGs
+    are fetched with HTTP range requests using the process-wide GDAL settings
+    above. Falls back to simulated data when the raster is not available.
+    
+    Args:
+        year (int): Year of the NDVI raster
+        bounds (tuple): (min_lon, min_lat, max_lon, max_lat) to read
+        
+    Returns:
+        np.ndarray: NDVI values over the bounds
+    """
+    import rasterio
+    
+    try:
+        return _read_output_raster(f'ndvi_maps/ndvi_{year}.tif', bounds, 'average')
+    except rasterio.errors.RasterioError:
+        return _ndvi(year)
+
+@st.cache_data(show_spinner=False)
+def load_land_cover(year, bounds=STUDY_AREA_BOUNDS):
+    """
+    Read the land cover classification COG for a year over the given bounds.
+    
+    Uses the same windowed, overview-aware read as load_ndvi, with mode
+    resampling so class values are preserved. Falls back to simulated data
+    when the raster is not available.
+    
+    Args:
+        year (int): Year of the classification raster
+        bounds (tuple): (min_lon, min_lat, max_lon, max_lat) to read
+        
+    Returns:
+        np.ndarray: Land cover class values over the bounds
+    """
+    import rasterio
+    
+    try:
+        return _read_output_raster(f'classification_maps/classification_{year}.tif', bounds, 'mode')
+    except rasterio.errors.RasterioError:
+        return _land_cover(year)
+
+def _read_output_raster(relative_path, bounds, resampling):
+    """
+    Windowed read of a backend output raster, capped to DISPLAY_MAX_SIDE pixels.
+    
+    Args:
+        relative_path (str): Path of the raster relative to the output directory
+        bounds (tuple): (min_lon, min_lat, max_lon, max_lat) to read
+        resampling (str): Resampling method used when reading at reduced size
+        
+    Returns:
+        np.ndarray: First band of the raster over the bounds
+    """
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.windows import from_bounds
+    
+    if COG_BASE_URL:
+        source = f"{COG_BASE_URL.rstrip('/')}/{relative_path}"
+    else:
+        source = OUTPUT_DIR / relative_path
+    
+    with rasterio.open(source) as ds:
+        window = from_bounds(*bounds, transform=ds.transform)
+        scale = max(1.0, max(window.height, window.width) / DISPLAY_MAX_SIDE)
+        out_shape = (max(1, round(window.height / scale)), max(1, round(window.width / scale)))
+        return ds.read(1, window=window, out_shape=out_shape, resampling=Resampling[resampling])
+
+@st.cache_resource(show_spinner=False)
+def _ndvi_lut():
+    """256-entry uint8 RGB lookup table of the RdYlGn colormap, built once."""
+    import matplotlib.pyplot as plt
+    
+    return plt.get_cmap('RdYlGn', 256)(np.arange(256), bytes=True)[:, :3]
+
+@st.cache_resource(show_spinner=False)
+def _land_cover_lut():
+    """uint8 RGBA lookup table of the land cover class colors, built once."""
+    import matplotlib.colors as mcolors
+    
+    return mcolors.ListedColormap(LAND_COVER_COLORS)(np.arange(len(LAND_COVER_COLORS)), bytes=True)
+
+@st.cache_data(show_spinner=False)
+def _ndvi_rgba(year):
+    """NDVI data for a year colormapped once to a uint8 RGB image."""
+    ndvi_data = _downsample(load_ndvi(year))
+    out = np.empty(ndvi_data.shape + (3,), dtype=np.uint8)
+    return _ndvi_lut_kernel()(ndvi_data, _ndvi_lut(), out)
+
+@st.cache_data(show_spinner=False)
+def _land_cover(year):
+    """Simulated land cover data for a year, generated once per year."""
+    # Stand-in used when the classification GeoTIFF for the year is not available
+    return np.random.default_rng(year).integers(0, 4, size=(50, 50), dtype=np.uint8)
+
+@st.cache_data(show_spinner=False)
+def _land_cover_rgba(year):
+    """Land cover classes for a year mapped once to a uint8 RGBA image."""
+    # Integer class values index the lookup table directly
+    return _land_cover_lut()[_downsample(load_land_cover(year))]
+
+# Leaflet callback building one species circle marker from a [lat, lon, species, date] row
+_SPECIES_MARKER_JS = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {radius: 4});
+    marker.bindPopup(row[2] + '<br>Date: ' + row[3]);
+    marker.bindTooltip(row[2]);
+    return marker;
+}
+"""
+
+@st.cache_resource(show_spinner=False)
+def _prefetch_years(years):
+    """
+    Warm the per-year raster caches in background threads, once per process.
+    
+    GDAL raster reads and the nogil colormap kernel release the GIL, so the
+    remaining years load concurrently while the first page is being viewed.
+    The kernel is serial, so concurrent calls never launch nested thread
+    pools. Failures
+    are left to surface when the year is requested in the foreground.
+    """
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='enviroscan-prefetch')
+    for year in years:
+        executor.submit(_ndvi_rgba, year)
+        executor.submit(_land_cover_rgba, year)
+    executor.shutdown(wait=False)
+    return executor
+
+@st.cache_resource(show_spinner=False)
+def _overview_map():
+    """Study area map rendered once to HTML and reused across reruns."""
+    import folium
+    
+    # Create a simple Folium map centered on Jim Corbett
+    corbett_coords = [29.45, 78.85]  # Approximate center
+    m = folium.Map(location=corbett_coords, zoom_start=10, prefer_canvas=True)
+    
+    # Add a marker for Jim Corbett
+    folium.Marker(
+        corbett_coords,
+        popup="Jim Corbett National Park",
+        tooltip="Jim Corbett National Park"
+    ).add_to(m)
+    
+    # Add a rectangle for the study area bounds
+    bounds = [[29.29, 78.56], [29.63, 79.15]]
+    folium.Rectangle(
+        bounds=bounds,
+        color="blue",
+        weight=2,
+        fill=False,
+        tooltip="Study Area Bounds"
+    ).add_to(m)
+    
+    return m._repr_html_()
+
+@st.cache_resource(show_spinner=False)
+def _cog_tile_map(cog_path, **render_params):
+    """Folium map rendered once to HTML with a TiTiler tile overlay for a COG."""
+    query = urlencode({'url': f"{COG_BASE_URL.rstrip('/')}/{cog_path}", **render_params})
+    tiles = TILER_URL.rstrip('/') + '/cog/tiles/WebMercatorQuad/{z}/{x}/{y}@2x.png?' + query
+    return _tile_layer_map(tiles, cog_path)
+
+@st.cache_resource(show_spinner=False)
+def _static_tile_map(pyramid):
+    """Folium map rendered once to HTML with a pre-rendered static tile pyramid overlay."""
+    # Relative to the app URL so it also works behind a base URL path
+    tiles = f'app/static/tiles/{pyramid}/' + '{z}/{x}/{y}.png'
+    return _tile_layer_map(tiles, pyramid)
+
+def _tile_layer_map(tiles, name):
+    """Render a Folium map of the study area with an XYZ tile overlay to HTML."""
+    import folium
+    
+    corbett_coords = [29.45, 78.85]
+    m = folium.Map(location=corbett_coords, zoom_start=10)
+    folium.raster_layers.TileLayer(
+        tiles=tiles,
+        attr='EnviroScan',
+        name=name,
+        overlay=True,
+        opacity=0.8
+    ).add_to(m)
+    
+    return m._repr_html_()
+
+@st.cache_resource(show_spinner=False)
+def _ndvi_figure(year):
+    """Plotly NDVI figure for a year, rasterized and drawn in the browser."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+    
+    # The colormapped image is shipped as a PNG and rendered client-side
+    fig = px.imshow(_ndvi_rgba(year), binary_string=True)
+    # Invisible trace carrying the NDVI colorbar
+    fig.add_trace(go.Scatter(
+        x=[None], y=[None], mode='markers', hoverinfo='skip', showlegend=False,
+        marker=dict(
+            color=[0], cmin=-1, cmax=1, colorscale='RdYlGn', showscale=True,
+            colorbar=dict(title='NDVI Value')
+        )
+    ))
+    fig.update_layout(title=f'Simulated NDVI Map - {year}', height=600)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _land_cover_pixels(year):
+    """
+    Land cover figure for a year drawn once, returned as uint8 RGB pixels.
+    
+    Every call builds its own figure on its own Agg canvas, so concurrent
+    sessions never share Matplotlib state; the cached pixels are what is reused.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.patches import Patch
+    
+    fig = Figure(figsize=(10, 6), layout='tight')
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.imshow(_land_cover_rgba(year), interpolation='nearest')
+    ax.set_title(f'Simulated Land Cover Classification - {year}')
+    
+    # Create custom legend
+    legend_elements = [
+        Patch(facecolor=color, label=label)
+        for label, color in zip(LAND_COVER_LABELS, LAND_COVER_COLORS)
+    ]
+    ax.legend(handles=legend_elements, bbox_to_anchor=(1.05, 1), loc='upper left')
+    
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())[..., :3].copy()
+
+@st.cache_data(show_spinner=False)
+def load_observations(csv_name, bounds=STUDY_AREA_BOUNDS):
+    """
+    Load the species observations that fall within the study area.
+    
+    The CSV is scanned lazily with Polars so the bounding-box filter and the
+    column selection are pushed down into the reader and only matching rows
+    are materialized.
+    
+    Args:
+        csv_name (str): Name of the observations CSV in the species data directory
+        bounds (tuple): (min_lon, min_lat, max_lon, max_lat) to keep
+        
+    Returns:
+        pl.DataFrame: species, latitude, longitude and date of each observation
+    """
+    import polars as pl
+    
+    min_lon, min_lat, max_lon, max_lat = bounds
+    return (
+        pl.scan_csv(SPECIES_DIR / csv_name)
+        .filter(
+            pl.col('latitude').is_between(min_lat, max_lat)
+            & pl.col('longitude').is_between(min_lon, max_lon)
+        )
+        .select('species', 'latitude', 'longitude', 'date')
+        .collect()
+    )
+
+@st.cache_resource(show_spinner=False)
+def _species_map(csv_name):
+    """Species map rendered once to HTML per observations file."""
+    import folium
+    from folium.plugins import FastMarkerCluster
+    
+    # Create a Folium map
+    corbett_coords = [29.45, 78.85]
+    m = folium.Map(location=corbett_coords, zoom_start=10, prefer_canvas=True)
+    
+    # Add all species observations as a single marker cluster
+    rows = load_observations(csv_name).select('latitude', 'longitude', 'species', 'date').rows()
+    FastMarkerCluster(data=rows, callback=_SPECIES_MARKER_JS).add_to(m)
+    
+    return m._repr_html_()
+
 def main():
     """Main function for the Streamlit dashboard."""
     # App title and description
@@ -32,7 +433,8 @@ def main():
     
     # Year selector
     years = [2000, 2010, 2020, 2025]
-    selected_year = st.sidebar.selectbox("Select Year", years, index=len(years)-1)
+    # Stored in session state so each tab fragment reads it on its own reruns
+    st.sidebar.selectbox("Select Year", years, index=len(years)-1, key='selected_year')
     
     # Layer selection
     st.sidebar.subheader("Map Layers")
@@ -58,19 +460,24 @@ def main():
     ])
     
     with tab1:
-        display_overview(selected_year)
+        display_overview()
     
     with tab2:
-        display_vegetation_analysis(selected_year)
+        display_vegetation_analysis()
     
     with tab3:
-        display_land_cover(selected_year)
+        display_land_cover()
     
     with tab4:
         display_species_distribution()
+    
+    # Load the other years in the background so switching years is instant
+    _prefetch_years(tuple(years))
 
-def display_overview(year):
+@st.fragment
+def display_overview():
     """Display overview information."""
+    year = st.session_state.selected_year
     st.header("Overview")
     
     # Study area information
@@ -95,32 +502,12 @@ def display_overview(year):
     
     # Map visualization
     st.subheader("Study Area Map")
-    
-    # Create a simple Folium map centered on Jim Corbett
-    corbett_coords = [29.45, 78.85]  # Approximate center
-    m = folium.Map(location=corbett_coords, zoom_start=10)
-    
-    # Add a marker for Jim Corbett
-    folium.Marker(
-        corbett_coords,
-        popup="Jim Corbett National Park",
-        tooltip="Jim Corbett National Park"
-    ).add_to(m)
-    
-    # Add a rectangle for the study area bounds
-    bounds = [[29.29, 78.56], [29.63, 79.15]]
-    folium.Rectangle(
-        bounds=bounds,
-        color="blue",
-        weight=2,
-        fill=False,
-        tooltip="Study Area Bounds"
-    ).add_to(m)
-    
-    st_folium(m, width=700, height=500)
+    st.iframe(_overview_map(), width=700, height=500)
 
-def display_vegetation_analysis(year):
+@st.fragment
+def display_vegetation_analysis():
     """Display vegetation analysis including NDVI maps."""
+    year = st.session_state.selected_year
     st.header("Vegetation Analysis")
     
     # NDVI information
@@ -133,76 +520,84 @@ def display_vegetation_analysis(year):
     - Negative values indicate water bodies
     """)
     
-    # Simulate NDVI visualization
-    # In practice, this would load and display actual NDVI GeoTIFF files
-    fig, ax = plt.subplots(figsize=(10, 6))
+    # Load NDVI data
+    ndvi_data = load_ndvi(year)
     
-    # Create simulated NDVI data
-    ndvi_data = np.random.uniform(-1, 1, (50, 50))
-    im = ax.imshow(ndvi_data, cmap='RdYlGn', vmin=-1, vmax=1)
-    ax.set_title(f'Simulated NDVI Map - {year}')
-    plt.colorbar(im, ax=ax, label='NDVI Value')
-    
-    st.pyplot(fig)
+    if TILER_URL and COG_BASE_URL:
+        # Serve the NDVI COG as map tiles so only the visible viewport is fetched
+        st.iframe(
+            _cog_tile_map(f'ndvi_maps/ndvi_{year}.tif', rescale='-1,1', colormap_name='rdylgn'),
+            width=700, height=500
+        )
+    else:
+        # Simulate NDVI visualization
+        # In practice, this would load and display actual NDVI GeoTIFF files
+        st.plotly_chart(_ndvi_figure(year))
     
     # Statistics
     st.subheader("NDVI Statistics")
     col1, col2, col3, col4 = st.columns(4)
+    mean, mn, mx, std = _stats_kernel()(ndvi_data)
     
-    col1.metric("Mean NDVI", f"{np.mean(ndvi_data):.3f}")
-    col2.metric("Min NDVI", f"{np.min(ndvi_data):.3f}")
-    col3.metric("Max NDVI", f"{np.max(ndvi_data):.3f}")
-    col4.metric("Std Dev", f"{np.std(ndvi_data):.3f}")
+    col1.metric("Mean NDVI", f"{mean:.3f}")
+    col2.metric("Min NDVI", f"{mn:.3f}")
+    col3.metric("Max NDVI", f"{mx:.3f}")
+    col4.metric("Std Dev", f"{std:.3f}")
 
-def display_land_cover(year):
+@st.fragment
+def display_land_cover():
     """Display land cover classification."""
+    year = st.session_state.selected_year
     st.header("Land Cover Classification")
     
     st.subheader(f"Land Cover Map - {year}")
     st.markdown("""
-    Land cover classification using Random Forest algorithm:
+    Land cover classification using Histogram Gradient Boosting:
     - **Forest** (Green)
     - **Water** (Blue)
     - **Urban** (Gray)
     - **Agriculture** (Yellow)
     """)
     
-    # Simulate land cover visualization
-    # In practice, this would load and display actual classification GeoTIFF files
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Create simulated land cover data
-    land_cover_data = np.random.choice([0, 1, 2, 3], size=(50, 50))
-    colors = ['green', 'blue', 'gray', 'yellow']
-    im = ax.imshow(land_cover_data, cmap=mcolors.ListedColormap(colors))
-    ax.set_title(f'Simulated Land Cover Classification - {year}')
-    
-    # Create custom legend
-    from matplotlib.patches import Patch
-    legend_elements = [
-        Patch(facecolor='green', label='Forest'),
-        Patch(facecolor='blue', label='Water'),
-        Patch(facecolor='gray', label='Urban'),
-        Patch(facecolor='yellow', label='Agriculture')
-    ]
-    ax.legend(handles=legend_elements, bbox_to_anchor=(1.05, 1), loc='upper left')
-    
-    st.pyplot(fig)
+    # Load land cover data; the same raster backs the map and the statistics
+    land_cover_data = load_land_cover(year)
+    
+    if TILER_URL and COG_BASE_URL:
+        import matplotlib.colors as mcolors
+        
+        # Serve the classification COG as map tiles with a discrete class colormap
+        colormap = {str(i): mcolors.to_hex(color) for i, color in enumerate(LAND_COVER_COLORS)}
+        st.iframe(
+            _cog_tile_map(f'classification_maps/classification_{year}.tif', colormap=json.dumps(colormap)),
+            width=700, height=500
+        )
+    elif (STATIC_TILES_DIR / f'classification_{year}').is_dir():
+        # Show the tile pyramid built offline, so nothing is rendered per request
+        st.iframe(_static_tile_map(f'classification_{year}'), width=700, height=500)
+    else:
+        # Simulate land cover visualization
+        # In practice, this would load and display actual classification GeoTIFF files
+        st.image(_land_cover_pixels(year))
     
     # Land cover statistics
     st.subheader("Land Cover Statistics")
-    unique, counts = np.unique(land_cover_data, return_counts=True)
-    labels = ['Forest', 'Water', 'Urban', 'Agriculture']
+    counts = np.bincount(land_cover_data.ravel(), minlength=len(LAND_COVER_LABELS))[:len(LAND_COVER_LABELS)]
+    percentages = counts.astype(np.float32) * np.float32(100.0 / land_cover_data.size)
     
-    # Create a DataFrame for the statistics
+    # Create a DataFrame for the statistics from whole columns
     stats_df = pd.DataFrame({
-        'Land Cover Type': [labels[i] for i in unique],
+        'Land Cover Type': LAND_COVER_LABELS,
         'Area (pixels)': counts,
-        'Percentage': [count/land_cover_data.size*100 for count in counts]
+        'Percentage': percentages
     })
     
-    st.table(stats_df)
+    st.dataframe(
+        stats_df,
+        hide_index=True,
+        column_config={'Percentage': st.column_config.NumberColumn(format='%.2f')}
+    )
 
+@st.fragment
 def display_species_distribution():
     """Display species distribution data."""
     st.header("Species Distribution")
@@ -213,37 +608,16 @@ def display_species_distribution():
     - **eBird** (Bird observations)
     """)
     
-    # Load simulated species data
-    # In practice, this would load actual CSV files
-    gbif_data = {
-        'species': ['Tiger', 'Leopard', 'Elephant', 'Deer', 'Bird'],
-        'latitude': [29.4, 29.35, 29.5, 29.45, 29.38],
-        'longitude': [78.8, 78.9, 79.0, 78.85, 78.95],
-        'date': ['2020-01-15', '2020-02-20', '2020-03-10', '2020-04-05', '2020-05-12']
-    }
+    # Load GBIF species observations within the study area
+    gbif_df = load_observations('gbif_species.csv')
     
-    gbif_df = pd.DataFrame(gbif_data)
-    
-    # Display species table
+    # Display species table; only the first rows are converted for display
     st.subheader("Species Observations")
-    st.dataframe(gbif_df)
+    st.dataframe(gbif_df.head(SPECIES_TABLE_ROWS).to_pandas(), hide_index=True)
     
     # Create species map
     st.subheader("Species Distribution Map")
-    
-    # Create a Folium map
-    corbett_coords = [29.45, 78.85]
-    m = folium.Map(location=corbett_coords, zoom_start=10)
-    
-    # Add markers for each species observation
-    for idx, row in gbif_df.iterrows():
-        folium.Marker(
-            [row['latitude'], row['longitude']],
-            popup=f"{row['species']}<br>Date: {row['date']}",
-            tooltip=row['species']
-        ).add_to(m)
-    
-    st_folium(m, width=700, height=500)
+    st.iframe(_species_map('gbif_species.csv'), width=700, height=500)
     
     # Biodiversity hotspot analysis
     st.subheader("Biodiversity Hotspots")